@@ -2,7 +2,7 @@
 Data processing utilities for Booli listings.
 """
 import logging
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable, Sequence
 
 import pandas as pd
 from tqdm import tqdm
@@ -19,9 +19,156 @@ class MissingDataError(Exception):
     """
 
 
+def get_nested_dict_value(
+    dictionary: dict, keys: Iterable, remove_numeric_formatting: bool = False
+) -> Any:
+    """
+    Retrieves a nested value from a dictionary based on a list of keys.
+
+    Parameters
+    ----------
+    dictionary
+        The dictionary to search through.
+    keys
+        A list of keys representing the path to the desired value. Note
+        that the keys have the been given in order of access.
+    remove_numeric_formatting
+        Example: If True '6 430 000' -> 6430000 else does nothing.
+
+    Returns
+    -------
+        The value found at the nested location, or None if any key is missing
+        or invalid.
+    """
+    current_value = dictionary
+    for key in keys:
+        if isinstance(current_value, dict) and key in current_value:
+            current_value = current_value[key]
+        else:
+            return None
+
+    if remove_numeric_formatting and isinstance(current_value, str):
+        current_value = _strip_numeric_formatting(current_value)
+    return current_value
+
+
+def make_nested_dict_getter(
+    keys: Sequence[str], remove_numeric_formatting: bool = False
+) -> Callable[[dict], Any]:
+    """
+    Builds an accessor equivalent to `get_nested_dict_value` for a fixed path of keys.
+
+    Paths of up to three keys are unrolled into chained lookups so that the per-entry
+    cost is a handful of dictionary accesses rather than a loop over the keys.
+
+    Parameters
+    ----------
+    keys
+        The keys representing the path to the desired value, in order of access.
+    remove_numeric_formatting
+        Example: If True '6 430 000' -> 6430000 else does nothing.
+
+    Returns
+    -------
+        A function taking a dictionary and returning the value found at the nested
+        location, or None if any key is missing or invalid.
+    """
+    match tuple(keys):
+        case (key,):
+
+            def getter(dictionary: dict) -> Any:
+                return dictionary.get(key)
+
+        case (key_1, key_2):
+
+            def getter(dictionary: dict) -> Any:
+                value = dictionary.get(key_1)
+                return value.get(key_2) if isinstance(value, dict) else None
+
+        case (key_1, key_2, key_3):
+
+            def getter(dictionary: dict) -> Any:
+                value = dictionary.get(key_1)
+                value = value.get(key_2) if isinstance(value, dict) else None
+                return value.get(key_3) if isinstance(value, dict) else None
+
+        case _:
+
+            def getter(dictionary: dict) -> Any:
+                return get_nested_dict_value(dictionary, keys)
+
+    if not remove_numeric_formatting:
+        return getter
+
+    def formatted_getter(dictionary: dict) -> Any:
+        value = getter(dictionary)
+        if isinstance(value, str):
+            return _strip_numeric_formatting(value)
+        return value
+
+    return formatted_getter
+
+
+def _strip_numeric_formatting(value: str) -> int:
+    """
+    Example
+    -------
+    '6\xa0430\xa0000\xa0kr' -> 6430000
+    """
+    return int(value.replace("\xa0", "").replace("kr", ""))
+
+
+PROPERTY_DETAIL_GETTERS: tuple[tuple[str, Callable[[dict], Any]], ...] = tuple(
+    (column_name, make_nested_dict_getter(keys, remove_numeric_formatting))
+    for column_name, keys, remove_numeric_formatting in (
+        ("booli_id", ["booliId"], False),
+        ("sold_date", ["soldDate"], False),
+        ("days_listed", ["daysActive"], False),
+        ("residence_type", ["objectType"], False),
+        ("address", ["streetAddress"], False),
+        ("tenure_form", ["tenureForm"], False),
+        ("apartment_number", ["apartmentNumber", "value"], False),
+        ("urban_area", ["descriptiveAreaName"], False),
+        ("municipality", ["location", "region", "municipalityName"], False),
+        ("living_area", ["livingArea", "raw"], False),
+        ("construction_year", ["constructionYear"], False),
+        ("list_price", ["listPrice", "raw"], False),
+        ("sold_price", ["soldPrice", "raw"], False),
+        ("sold_price_type", ["soldPriceType"], False),
+        ("first_price", ["firstPrice", "value"], False),
+        ("booli_valuation", ["estimate", "price", "raw"], False),
+        ("booli_valuation_lb", ["estimate", "low", "value"], True),
+        ("booli_valuation_ub", ["estimate", "high", "formatted"], True),
+        ("monthly_payment", ["monthlyPayment", "formatted"], False),
+        ("rent", ["rent", "raw"], False),
+        ("operating_cost", ["operatingCost", "raw"], False),
+        ("energy_class", ["energyClass", "score"], False),
+        ("floor", ["floor", "value"], False),
+        ("building_floors", ["buildingFloors"], False),
+        ("latitude", ["latitude"], False),
+        ("longitude", ["longitude"], False),
+        ("has_solar_panels", ["hasSolarPanels"], False),
+        ("agency_id", ["agencyId"], False),
+        ("agent_id", ["agentId"], False),
+    )
+)
+# columns derived from the entry itself, before and after the property details
+ENTRY_COLUMN_NAMES: tuple[str, ...] = ("url_listing_type", "url_listing_id", "market_status")
+PREVIOUS_SALES_COLUMN_NAMES: tuple[str, ...] = ("booli_ids_of_previous_sales", "n_previous_sales")
+COLUMN_NAMES: tuple[str, ...] = (
+    ENTRY_COLUMN_NAMES
+    + tuple(column_name for column_name, _ in PROPERTY_DETAIL_GETTERS)
+    + PREVIOUS_SALES_COLUMN_NAMES
+)
+
+
 def format_json_to_dataframe(data: Iterable[JSONDataType]) -> pd.DataFrame:
     """
     Processes scraped JSON data, extracts details and reformats to dataframe.
+
+    Extracted details are accumulated column-wise, one list per name in `COLUMN_NAMES`,
+    so that pandas can build each column directly instead of inferring them from a
+    list of row dictionaries.
     """
 
     def get_sold_property_details(entry: JSONDataType) -> JSONDataType:
@@ -42,16 +189,16 @@ def format_json_to_dataframe(data: Iterable[JSONDataType]) -> pd.DataFrame:
             Available keys are {available_keys}."""
         )
 
-    def parse_url_id(entry: JSONDataType):
+    def parse_url_id(entry: JSONDataType) -> tuple[str, int]:
         """
         Example
         -------
-        'bostad/2556516' -> {'listing_type': 'bostad', 'listing_id': 2556516}
+        'bostad/2556516' -> ('bostad', 2556516)
         """
-        parts = entry["id"].split("/")
-        return {"url_listing_type": parts[0], "url_listing_id": int(parts[1])}
+        listing_type, _, listing_id = entry["id"].partition("/")
+        return listing_type, int(listing_id)
 
-    def get_previous_sales(property_details: JSONDataType) -> JSONDataType:
+    def get_previous_sales(property_details: JSONDataType) -> list[int]:
         previous_sales: list[int] = []
         if (
             isinstance(property_details, dict)
@@ -60,12 +207,12 @@ def format_json_to_dataframe(data: Iterable[JSONDataType]) -> pd.DataFrame:
         ):
             for sale in property_details["salesOfResidence"]:
                 previous_sales.append(int(sale["booliId"]))
-        return {
-            "booli_ids_of_previous_sales": previous_sales,
-            "n_previous_sales": len(previous_sales),
-        }
+        return previous_sales
 
-    listings = []
+    columns: dict[str, list[Any]] = {column_name: [] for column_name in COLUMN_NAMES}
+    property_detail_appenders = tuple(
+        (columns[column_name].append, getter) for column_name, getter in PROPERTY_DETAIL_GETTERS
+    )
     for entry in tqdm(data, desc="Processing scraped JSON content to dataframe..."):
         try:
             property_details = get_sold_property_details(entry)
@@ -77,102 +224,13 @@ def format_json_to_dataframe(data: Iterable[JSONDataType]) -> pd.DataFrame:
             )
             continue
 
-        extracted_details = (
-            parse_url_id(entry)
-            | {
-                "market_status": entry["data"]["market_status"],
-                "booli_id": property_details.get("booliId"),
-                "sold_date": property_details.get("soldDate"),
-                "days_listed": property_details.get("daysActive"),
-                "residence_type": property_details.get("objectType"),
-                "address": property_details.get("streetAddress"),
-                "tenure_form": property_details.get("tenureForm"),
-                "apartment_number": get_nested_dict_value(
-                    property_details, ["apartmentNumber", "value"]
-                ),
-                "urban_area": property_details.get("descriptiveAreaName"),
-                "municipality": get_nested_dict_value(
-                    property_details, ["location", "region", "municipalityName"]
-                ),
-                "living_area": get_nested_dict_value(
-                    property_details, ["livingArea", "raw"]
-                ),
-                "construction_year": property_details.get("constructionYear"),
-                "list_price": get_nested_dict_value(
-                    property_details, ["listPrice", "raw"]
-                ),
-                "sold_price": get_nested_dict_value(
-                    property_details, ["soldPrice", "raw"]
-                ),
-                "sold_price_type": property_details.get("soldPriceType"),
-                "first_price": get_nested_dict_value(
-                    property_details, ["firstPrice", "value"]
-                ),
-                "booli_valuation": get_nested_dict_value(
-                    property_details, ["estimate", "price", "raw"]
-                ),
-                "booli_valuation_lb": get_nested_dict_value(
-                    property_details,
-                    ["estimate", "low", "value"],
-                    remove_numeric_formatting=True,
-                ),
-                "booli_valuation_ub": get_nested_dict_value(
-                    property_details,
-                    ["estimate", "high", "formatted"],
-                    remove_numeric_formatting=True,
-                ),
-                "monthly_payment": get_nested_dict_value(
-                    property_details, ["monthlyPayment", "formatted"]
-                ),
-                "rent": get_nested_dict_value(property_details, ["rent", "raw"]),
-                "operating_cost": get_nested_dict_value(
-                    property_details, ["operatingCost", "raw"]
-                ),
-                "energy_class": get_nested_dict_value(
-                    property_details, ["energyClass", "score"]
-                ),
-                "floor": get_nested_dict_value(property_details, ["floor", "value"]),
-                "building_floors": property_details.get("buildingFloors"),
-                "latitude": property_details.get("latitude"),
-                "longitude": property_details.get("longitude"),
-                "has_solar_panels": property_details.get("hasSolarPanels"),
-                "agency_id": property_details.get("agencyId"),
-                "agent_id": property_details.get("agentId"),
-            }
-            | get_previous_sales(property_details)
-        )
-        listings.append(extracted_details)
-    return pd.DataFrame(listings)
-
-
-def get_nested_dict_value(
-    dictionary: dict, keys: Iterable, remove_numeric_formatting: bool = False
-) -> Any:
-    """
-    Retrieves a nested value from a dictionary based on a list of keys.
-
-    Parameters
-    ----------
-    dictionary
-        The dictionary to search through.
-    keys
-        A list of keys representing the path to the desired value. Note
-        that the keys have the been given in order of access.
-    remove_numeric_formatting
-        Example: If True '6 430 000' -> 6430000 else does nothing.
-
-    Returns
-    -------
-        The value found at the nested location, or None if any key is missing
-        or invalid.
-    """
-    current_value = dictionary
-    for key in keys:
-        if isinstance(current_value, dict) and key in current_value:
-            current_value = current_value[key]
-        else:
-            return None
-
-    if remove_numeric_formatting and isinstance(current_value, str):
-        current_value = int(current_value.replace("\xa0", "").replace("kr", ""))
-    return current_value
+        url_listing_type, url_listing_id = parse_url_id(entry)
+        previous_sales = get_previous_sales(property_details)
+        columns["url_listing_type"].append(url_listing_type)
+        columns["url_listing_id"].append(url_listing_id)
+        columns["market_status"].append(entry["data"]["market_status"])
+        columns["booli_ids_of_previous_sales"].append(previous_sales)
+        columns["n_previous_sales"].append(len(previous_sales))
+        for append, getter in property_detail_appenders:
+            append(getter(property_details))
+    return pd.DataFrame(columns, columns=COLUMN_NAMES)
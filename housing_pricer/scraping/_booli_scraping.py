@@ -1,18 +1,15 @@
 """
 Utilities for scraping Booli.
 """
-import json
-
-# pylint: disable=invalid-name
+import html
 import logging
 import re
-import time
-from enum import auto
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from itertools import count
+from time import monotonic
 from typing import Any
 
-from bs4 import BeautifulSoup, Tag
-from strenum import StrEnum
+import orjson
 from tqdm import tqdm
 
 from housing_pricer.scraping.utilities.scraper import (
@@ -25,13 +22,13 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class ListingType(StrEnum):
-    """
-    Used to differentiate between listing types.
-    """
+# listing types, used to differentiate between listing endpoints
+ANNONS = "annons"
+BOSTAD = "bostad"
+LISTING_TYPES = (ANNONS, BOSTAD)
 
-    annons = auto()
-    bostad = auto()
+LISTING_URL_PATTERN = re.compile(rb"https://www\.booli\.se/(annons|bostad)/(\d+)")
+LISTING_TYPES_BY_BYTES = {listing_type.encode(): listing_type for listing_type in LISTING_TYPES}
 
 
 class DataProcessingError(Exception):
@@ -42,15 +39,18 @@ class DataProcessingError(Exception):
         super().__init__(self.msg)
 
 
-def scrape_listings(scraper: Scraper, duration_hrs: float):
+def scrape_listings(scraper: Scraper, duration_hrs: float, max_concurrent_requests: int = 4):
     """
     Scrapes Booli listings for a specified duration, extracting relevant data
     and saving to file.
+
+    The listings of a search page are fetched concurrently by up to
+    `max_concurrent_requests` threads, all subject to the scraper's rate limit.
     """
 
     def fetch_listings_from_search_result(
         scraper: Scraper, search_endpoint: str
-    ) -> list[dict[str, Any]] | None:
+    ) -> list[tuple[str, str]] | None:
         try:
             search_result = scraper.get(f"{search_endpoint}")
             return extract_listing_types_and_ids(search_result)
@@ -59,58 +59,91 @@ def scrape_listings(scraper: Scraper, duration_hrs: float):
             logger.info(exc)
             return None
 
+    def fetch_listing(scraper: Scraper, endpoint: str) -> dict[str, Any]:
+        listing_content = scraper.get(endpoint)
+        return extract_relevant_data_as_json(listing_content)
+
     def process_listings(
-        scraper: Scraper, listings: list[dict[str, Any]], page_nr: int, date: str
+        scraper: Scraper,
+        listing_fetcher: ThreadPoolExecutor,
+        listings: list[tuple[str, str]],
+        page_nr: int,
+        date: str,
     ) -> int:
+        # listings are fetched and parsed concurrently but saved from this thread only;
+        # endpoints are deduplicated and filtered against already scraped ones up front
+        # since an endpoint is only marked as scraped once it is saved
+        endpoints = [
+            endpoint
+            for endpoint in dict.fromkeys(
+                f"{listing_type}/{listing_id}" for listing_type, listing_id in listings
+            )
+            if not scraper.data_manager.is_endpoint_scraped(endpoint)
+        ]
+        fetched_listings = {
+            listing_fetcher.submit(fetch_listing, scraper, endpoint): endpoint
+            for endpoint in endpoints
+        }
         scraped_count = 0
-        for listing_meta_info in tqdm(
-            listings, desc=f"Scraping from search page number {page_nr}..."
-        ):
-            try:
-                endpoint = f"{listing_meta_info['listing_type']}/{listing_meta_info['listing_id']}"
-                listing_content = scraper.get(endpoint)
-                data = extract_relevant_data_as_json(listing_content)
-
-                scraper.data_manager.append_data_to_file(
-                    endpoint_id=endpoint, date=date, data=data
-                )
-                scraped_count += 1
+        try:
+            for fetched_listing in tqdm(
+                as_completed(fetched_listings),
+                total=len(fetched_listings),
+                desc=f"Scraping from search page number {page_nr}...",
+            ):
+                try:
+                    scraper.data_manager.append_data_to_file(
+                        endpoint_id=fetched_listings[fetched_listing],
+                        date=date,
+                        data=fetched_listing.result(),
+                    )
+                    scraped_count += 1
 
-            except (AlreadyScrapedError, ScrapeError, DataProcessingError) as exc:
-                logger.info(exc)
-            except OSError as exc:
-                logger.error("%s", exc)
-                continue
+                except (AlreadyScrapedError, ScrapeError, DataProcessingError) as exc:
+                    logger.info(exc)
+                except OSError as exc:
+                    logger.error("%s", exc)
+        finally:
+            for fetched_listing in fetched_listings:
+                fetched_listing.cancel()
 
+        try:
+            scraper.data_manager.flush()
+        except OSError as exc:
+            # like a failed save, a failed flush is logged rather than ending the run
+            logger.error("%s", exc)
         return scraped_count
 
-    start_time = time.time()
+    deadline = monotonic() + duration_hrs * 60**2
     n_listings_scraped = 0
 
-    with scraper.data_manager:
-        while time.time() - start_time < duration_hrs * 60**2:
-            for date in scraper.data_manager.dates_to_scrape:
-                logger.info("Starting to scrape from date: %s", date)
-                for page_nr in count():
-                    search_endpoint = f"sok/slutpriser?maxSoldDate={date}&minSoldDate={date}&page={page_nr}"
-                    listings = fetch_listings_from_search_result(
-                        scraper, search_endpoint
-                    )
+    with scraper.data_manager, ThreadPoolExecutor(
+        max_workers=max_concurrent_requests
+    ) as listing_fetcher:
+        for date in scraper.data_manager.dates_to_scrape:
+            logger.info("Starting to scrape from date: %s", date)
+            for page_nr in count():
+                if monotonic() >= deadline:
+                    logger.info("Scraping duration reached while scraping date: %s", date)
+                    return
+
+                search_endpoint = (
+                    f"sok/slutpriser?maxSoldDate={date}&minSoldDate={date}&page={page_nr}"
+                )
+                listings = fetch_listings_from_search_result(scraper, search_endpoint)
 
-                    if isinstance(listings, list) and listings:
-                        n_listings_scraped += process_listings(
-                            scraper, listings, page_nr, date
-                        )
-                        logger.info(
-                            "Number of listings scraped: %d", n_listings_scraped
-                        )
-                    else:
-                        break
+                if isinstance(listings, list) and listings:
+                    n_listings_scraped += process_listings(
+                        scraper, listing_fetcher, listings, page_nr, date
+                    )
+                    logger.info("Number of listings scraped: %d", n_listings_scraped)
+                else:
+                    break
 
-                logger.info("Finished scraping date: %s", date)
+            logger.info("Finished scraping date: %s", date)
 
 
-def extract_listing_types_and_ids(search_content: bytes) -> list[dict[str, Any]]:
+def extract_listing_types_and_ids(search_content: bytes) -> list[tuple[str, str]]:
     """
     Extracts listing types and IDs from the given search content.
 
@@ -125,35 +158,74 @@ def extract_listing_types_and_ids(search_content: bytes) -> list[dict[str, Any]]
 
     Returns
     -------
-        List of dictionaries, each containing a listing's type and id.
+        List of (listing type, listing id) tuples.
     """
-    pattern = r"https://www\.booli\.se/(annons|bostad)/(\d+)"
-    listings = []
-    for match in re.finditer(pattern, search_content.decode()):
-        listings.append(
-            {"listing_type": ListingType[match.group(1)], "listing_id": match.group(2)}
-        )
-    return listings
-
-
-def extract_market_status(parsed_html_response: BeautifulSoup) -> str:
-    """Extracts market status of listings html response."""
-    status = parsed_html_response.find(
-        "div",
-        {
-            # pylint: disable=line-too-long
-            "class": """py-1 rounded w-fit bg-bui-color-black text-bui-color-white inline-flex items-center justify-center font-semibold rounded px-2 text-sm"""
-        },
-    )
-    if status:
-        return status.text
+    return [
+        (LISTING_TYPES_BY_BYTES[listing_type], listing_id.decode())
+        for listing_type, listing_id in LISTING_URL_PATTERN.findall(search_content)
+    ]
+
+
+MARKET_STATUS_CLASS = (
+    "py-1 rounded w-fit bg-bui-color-black text-bui-color-white inline-flex "
+    "items-center justify-center font-semibold rounded px-2 text-sm"
+)
+# starts with the class literal so that the regex engine can skip ahead to it directly
+# instead of trying a match at every opening div tag; that the class belongs to a div
+# is checked on the matched candidates with `DIV_TAG_START_PATTERN`
+MARKET_STATUS_CLASS_PATTERN = re.compile(
+    rb'class="' + re.escape(MARKET_STATUS_CLASS.encode()) + rb'"[^>]*>'
+)
+DIV_TAG_START_PATTERN = re.compile(rb"<div\s(?:[^>]*\s)?")
+# opening and closing div tags, used to find the closing tag matching the status div
+DIV_TAG_PATTERN = re.compile(rb"<(/?)div\b[^>]*>")
+TAG_PATTERN = re.compile(rb"<[^>]*>")
+NEXT_DATA_PATTERN = re.compile(
+    rb'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', flags=re.DOTALL
+)
+
+
+def extract_market_status(html_content: bytes) -> str:
+    """
+    Extracts market status of listings html response.
+
+    The status is the text of the first div with the market status class, with any
+    inner tags stripped, like the div's text; inner divs are matched to their closing
+    tags so that they do not end the status early.
+    """
+    for status_class in MARKET_STATUS_CLASS_PATTERN.finditer(html_content):
+        tag_start = html_content.rfind(b"<", 0, status_class.start())
+        if tag_start != -1 and DIV_TAG_START_PATTERN.fullmatch(
+            html_content, tag_start, status_class.start()
+        ):
+            status_end = _find_closing_div_tag(html_content, status_class.end())
+            if status_end is not None:
+                status = html_content[status_class.end() : status_end]
+                return html.unescape(TAG_PATTERN.sub(b"", status).decode())
     raise DataProcessingError("Entry missing market status tag.")
 
 
+def _find_closing_div_tag(html_content: bytes, pos: int) -> int | None:
+    """
+    Returns the position of the closing tag of a div whose content starts at `pos`, or
+    None if the div is not closed.
+    """
+    depth = 1
+    for div_tag in DIV_TAG_PATTERN.finditer(html_content, pos):
+        depth += -1 if div_tag.group(1) else 1
+        if depth == 0:
+            return div_tag.start()
+    return None
+
+
 def extract_relevant_data_as_json(html_content: bytes | str) -> dict[str, Any]:
     """
     Process the HTML content and keep only essential data in JSON format.
 
+    Only the `__NEXT_DATA__` script body and the market status are needed, so both
+    are extracted with precompiled regexes over the raw bytes rather than by building
+    an HTML tree.
+
     Parameters
     ----------
         html_content: The HTML content as bytes or str.
@@ -167,24 +239,24 @@ def extract_relevant_data_as_json(html_content: bytes | str) -> dict[str, Any]:
         DataProcessingError: If any step in the data processing fails.
     """
     try:
-        parsed_html = BeautifulSoup(html_content, features="lxml")
-        parsed_relevant_section = parsed_html.find(
-            name="script", attrs={"id": "__NEXT_DATA__"}
-        )
-        market_status = extract_market_status(parsed_html)
+        if isinstance(html_content, str):
+            html_content = html_content.encode()
+
+        relevant_section = NEXT_DATA_PATTERN.search(html_content)
+        market_status = extract_market_status(html_content)
 
-        if isinstance(parsed_relevant_section, Tag) and parsed_relevant_section.string:
-            section_data_json = json.loads(s=parsed_relevant_section.string)
+        if relevant_section and relevant_section.group(1):
+            section_data_json = orjson.loads(relevant_section.group(1))
             relevant_data = section_data_json["props"]["pageProps"]["__APOLLO_STATE__"]
             relevant_data.pop("ROOT_QUERY", None)
             relevant_data["market_status"] = market_status
             return relevant_data
 
         raise DataProcessingError(
-            "Relevant script tag with specified id not found in html-parser."
+            "Relevant script tag with specified id not found in html content."
         )
 
-    except json.JSONDecodeError as exc:
+    except (orjson.JSONDecodeError, UnicodeDecodeError) as exc:
         raise DataProcessingError("Failed to decode JSON.") from exc
     except (KeyError, AttributeError) as exc:
         raise DataProcessingError("Error accessing data.") from exc
@@ -29,13 +29,22 @@ DATA_STORAGE_PATH: str = "data_storage"
     default=200,
     type=int,
 )
-def main(scraping_duration_hrs: float, max_requests_per_minute: int):
+@click.option(
+    "--max_concurrent_requests",
+    "-c",
+    help="""Max number of listing requests in flight at once. All requests
+            are still subject to the requests per minute limit.""",
+    default=4,
+    type=int,
+)
+def main(scraping_duration_hrs: float, max_requests_per_minute: int, max_concurrent_requests: int):
     """
     initializes the scraper and DataManager, and starts the scraping process.
     """
 
     def _input_validation():
         assert scraping_duration_hrs > 0
+        assert max_concurrent_requests > 0
 
     _input_validation()
 
@@ -44,10 +53,12 @@ def main(scraping_duration_hrs: float, max_requests_per_minute: int):
         data_manager=DataManager(DATA_STORAGE_PATH),
         max_requests_per_minute=max_requests_per_minute,
         max_delay_seconds=20,
+        max_connections=max_concurrent_requests,
     )
     scrape_listings(
         scraper=booli_scraper,
         duration_hrs=scraping_duration_hrs,
+        max_concurrent_requests=max_concurrent_requests,
     )
 
 
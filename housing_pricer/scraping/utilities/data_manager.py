@@ -2,12 +2,14 @@
 Defines the DataManager class for handling storing and loading of data, and keeping
 track of data source.
 """
-import json
 import logging
+import os
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Iterable
 
+import orjson
 from tqdm import tqdm
 
 from housing_pricer.scraping.utilities.delayed_keyboard_interrupt import DelayedKeyboardInterrupt
@@ -15,8 +17,23 @@ from housing_pricer.scraping.utilities.delayed_keyboard_interrupt import Delayed
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Entries are written by orjson with "id" and "date" as the leading keys, so the
+# fields needed at startup can be read off the line prefix without parsing "data".
+ENTRY_ID_AND_DATE_PATTERN = re.compile(rb'\{"id":"([^"\\]*)","date":"([^"\\]*)"')
 
-class DataManager:
+
+def _read_id_and_date(line: bytes) -> tuple[Any, str]:
+    """
+    Read the `id` and `date` of an entry off its line prefix where possible, and fully
+    parse the line otherwise.
+    """
+    if match := ENTRY_ID_AND_DATE_PATTERN.match(line):
+        return match[1].decode(), match[2].decode()
+    entry = orjson.loads(line)
+    return entry["id"], entry["date"]
+
+
+class DataManager:  # pylint: disable=too-many-instance-attributes
     """
     DataManager is designed to be used as a context manager when saving data, ensuring
     proper opening and closing of the file.
@@ -27,8 +44,9 @@ class DataManager:
 
     def __init__(
         self,
-        base_dir: str,
+        base_dir: str | Path,
         data_filename: str = "scraped_data",
+        write_batch_size: int = 64,
     ):
         """
         Initialize the DataManager with a specified base directory and data file.
@@ -36,15 +54,23 @@ class DataManager:
         Parameters
         ----------
         base_dir
-            The base directory path as a string where data files will be
+            The base directory path where data files will be
             saved and loaded from.
         data_filename
             The name of the JSON file to store scraped data in.
+        write_batch_size
+            Number of appended entries to buffer in memory before they are written
+            to file in a single write.
         """
         self._base_dir = Path(base_dir)
         self._base_dir.mkdir(parents=True, exist_ok=True)
         self._data_file_path = self._base_dir / f"{data_filename}.json"
         self._data_file_handle = None
+        self._index_file_path = self._base_dir / f"{data_filename}.ids"
+        self._index_file_handle = None
+        self._write_batch_size = write_batch_size
+        self._write_buffer: list[bytes] = []
+        self._index_buffer: list[bytes] = []
         self._scraped_endpoints = set()
         self._scraped_dates = set()
         self.dates_to_scrape: Iterable[str]
@@ -66,19 +92,113 @@ class DataManager:
         """
         self._load_scraped_endpoints_and_dates()
         self.dates_to_scrape = self._get_dates_to_scrape()
-        self._data_file_handle = open(self._data_file_path, "a", encoding="utf-8")
+        self._data_file_handle = open(self._data_file_path, "ab")
+        self._index_file_handle = open(self._index_file_path, "ab")
         return self
 
     def _load_scraped_endpoints_and_dates(self):
         """
         Loads already scraped endpoints and dates to avoid re-scraping.
+
+        The pairs are read from the index file kept next to the data file, which is
+        rebuilt from the data file if it is missing, unreadable or was written for a
+        data file of another size.
+        """
+        if not self._data_file_path.exists():
+            # an index left behind by a removed data file would mark its entries as scraped
+            self._index_file_path.unlink(missing_ok=True)
+            return
+        self._truncate_partial_last_line()
+        try:
+            ids_and_dates, indexed_data_file_size = self._read_index_file()
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            ids_and_dates, indexed_data_file_size = [], None
+
+        if indexed_data_file_size != self._data_file_path.stat().st_size:
+            logger.info("Index file %s is out of date, rebuilding it.", self._index_file_path)
+            self._rebuild_index_file()
+            ids_and_dates, _ = self._read_index_file()
+
+        self._scraped_endpoints.update(endpoint_id for endpoint_id, _ in ids_and_dates)
+        self._scraped_dates.update(date for _, date in ids_and_dates)
+
+    def _truncate_partial_last_line(self):
+        """
+        Remove a last line of the data file that was cut short, e.g. by a crash while
+        writing, so that it is neither marked as scraped nor continued by the next
+        appended entry.
+        """
+        with open(self._data_file_path, "r+b") as data_file:
+            search_end = data_file.seek(0, os.SEEK_END)
+            if search_end == 0:
+                return
+            data_file.seek(-1, os.SEEK_END)
+            if data_file.read(1) == b"\n":
+                return
+
+            complete_lines_size = 0
+            while search_end > 0:
+                search_start = max(0, search_end - 2**16)
+                data_file.seek(search_start)
+                last_newline = data_file.read(search_end - search_start).rfind(b"\n")
+                if last_newline != -1:
+                    complete_lines_size = search_start + last_newline + 1
+                    break
+                search_end = search_start
+
+            logger.warning(
+                "Removing partially written last line of %s, it will be scraped again.",
+                self._data_file_path,
+            )
+            data_file.truncate(complete_lines_size)
+
+    def _read_index_file(self) -> tuple[list[list[Any]], int | None]:
+        """
+        Read the index file in a single parse.
+
+        The index file holds one `[endpoint_id, date]` line per entry, and after each
+        written batch a line with the size in bytes of the data file at that point.
+
+        Returns
+        -------
+            The `[endpoint_id, date]` pairs, and the data file size recorded last or
+            None if the index file does not end with one.
+        """
+        with open(self._index_file_path, "rb") as index_file:
+            lines = index_file.read().splitlines()
+        records = orjson.loads(b"[" + b",".join(lines) + b"]")
+
+        if not records:
+            indexed_data_file_size = 0
+        elif isinstance(records[-1], int):
+            indexed_data_file_size = records[-1]
+        else:
+            indexed_data_file_size = None
+        ids_and_dates = [record for record in records if isinstance(record, list)]
+        return ids_and_dates, indexed_data_file_size
+
+    def _rebuild_index_file(self):
         """
-        if self._data_file_path.exists():
-            for entry in tqdm(
-                self.load_data(), desc="Loading already scraped endpoints and dates..."
-            ):
-                self._mark_endpoint_scraped(entry["id"])
-                self._mark_date_scraped(entry["date"])
+        Rewrite the index file from the `id` and `date` fields of every entry in the
+        data file, followed by the size of the data file up to its last complete line.
+
+        Only lines ending in a newline are indexed, as a line cut short by a crash would
+        still match the prefix; it is also left out of the recorded size, which then
+        matches the data file once the line is removed on entry.
+        """
+        indexed_data_file_size = 0
+        with open(self._data_file_path, "rb") as data_file, open(
+            self._index_file_path, "wb"
+        ) as index_file:
+            for line in tqdm(data_file, desc="Indexing already scraped endpoints and dates..."):
+                if not line.endswith(b"\n"):
+                    break
+                indexed_data_file_size += len(line)
+                if line.strip():
+                    index_file.write(
+                        orjson.dumps(_read_id_and_date(line), option=orjson.OPT_APPEND_NEWLINE)
+                    )
+            index_file.write(orjson.dumps(indexed_data_file_size, option=orjson.OPT_APPEND_NEWLINE))
 
     def _get_dates_to_scrape(
         self, back_to_date: str = "2015-01-01", _today: str | None = None
@@ -91,41 +211,50 @@ class DataManager:
         """
 
         def generate_date_range(end_date, start_date) -> Iterable[str]:
-            n_days = (end_date - start_date).days + 1
-            yield from ((end_date - timedelta(days=x)).strftime("%Y-%m-%d") for x in range(n_days))
+            yield from (
+                datetime.fromordinal(ordinal).date().isoformat()
+                for ordinal in range(end_date.toordinal(), start_date.toordinal() - 1, -1)
+            )
 
         if _today is None:
             yesterday = datetime.today().date() - timedelta(days=1)
         else:
-            yesterday = datetime.strptime(_today, "%Y-%m-%d").date() - timedelta(days=1)
+            yesterday = datetime.fromisoformat(_today).date() - timedelta(days=1)
 
-        back_to_date_ = datetime.strptime(back_to_date, "%Y-%m-%d").date()
+        back_to_date_ = datetime.fromisoformat(back_to_date).date()
 
         if not self._scraped_dates:
             yield from generate_date_range(end_date=yesterday, start_date=back_to_date_)
             return
 
-        dates_as_ymd_datetimes = [
-            datetime.strptime(date, "%Y-%m-%d") for date in self._scraped_dates
-        ]
-        latest_scraped_date = max(dates_as_ymd_datetimes).date()
-        earliest_scraped_date = min(dates_as_ymd_datetimes).date()
+        # YYYY-MM-DD strings sort chronologically, so only the extremes need parsing
+        latest_scraped_date = datetime.fromisoformat(max(self._scraped_dates)).date()
+        earliest_scraped_date = datetime.fromisoformat(min(self._scraped_dates)).date()
 
         yield from generate_date_range(end_date=yesterday, start_date=latest_scraped_date)
         yield from generate_date_range(end_date=earliest_scraped_date, start_date=back_to_date_)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        Context manager exit method for DataManager which ensures that the file
-        handle is closed when exiting context.
+        Context manager exit method for DataManager which ensures that buffered
+        entries are written and the file handles are closed when exiting context, also
+        if writing the entries fails.
         """
         assert self._data_file_handle is not None
-        self._data_file_handle.close()
+        assert self._index_file_handle is not None
+        try:
+            self._flush_write_buffer()
+        finally:
+            self._data_file_handle.close()
+            self._index_file_handle.close()
 
     def append_data_to_file(self, endpoint_id: str | int, date: str, data: dict[str, Any]):
         """
         Append data in JSON format to file.
 
+        Entries are buffered and written in batches of `write_batch_size`; any
+        remaining entries are written when exiting the context.
+
         Parameters
         ----------
         id
@@ -134,11 +263,46 @@ class DataManager:
             The data to be saved, assumed to be in a format compatible with JSON serialization.
         """
         assert self._data_file_handle is not None
+        entry = {"id": endpoint_id, "date": date, "data": data}
+        self._write_buffer.append(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
+        self._index_buffer.append(
+            orjson.dumps((endpoint_id, date), option=orjson.OPT_APPEND_NEWLINE)
+        )
+        self._mark_endpoint_scraped(endpoint_id)
+        if len(self._write_buffer) >= self._write_batch_size:
+            self._flush_write_buffer()
+
+    def flush(self):
+        """
+        Write all buffered entries to file and sync the file to disk.
+        """
+        assert self._data_file_handle is not None
+        self._flush_write_buffer()
+        self._data_file_handle.flush()
+        os.fsync(self._data_file_handle.fileno())
+
+    def _flush_write_buffer(self):
+        """
+        Write all buffered entries to file in a single write, followed by their
+        index file lines and the resulting size of the data file.
+        """
+        if not self._write_buffer and not self._index_buffer:
+            return
+        assert self._data_file_handle is not None
+        assert self._index_file_handle is not None
         with DelayedKeyboardInterrupt():
-            entry = {"id": endpoint_id, "date": date, "data": data}
-            json_data = json.dumps(entry)
-            self._data_file_handle.write(json_data + "\n")
-            self._mark_endpoint_scraped(endpoint_id)
+            if self._write_buffer:
+                self._data_file_handle.write(b"".join(self._write_buffer))
+                self._data_file_handle.flush()
+                # cleared before the index is written so that a failed index write does
+                # not lead to the entries being written to the data file again
+                self._write_buffer.clear()
+                self._index_buffer.append(
+                    orjson.dumps(self._data_file_handle.tell(), option=orjson.OPT_APPEND_NEWLINE)
+                )
+            self._index_file_handle.write(b"".join(self._index_buffer))
+            self._index_file_handle.flush()
+            self._index_buffer.clear()
 
     def load_data(self) -> Iterable[Any]:
         """
@@ -151,9 +315,9 @@ class DataManager:
             Yields deserialized data objects from the file.
         """
         try:
-            with open(self._data_file_path, "r", encoding="utf-8") as data_file:
+            with open(self._data_file_path, "rb") as data_file:
                 for entry in data_file:
-                    yield json.loads(entry)
+                    yield orjson.loads(entry)
         except EOFError:
             return
 
@@ -5,11 +5,14 @@ and data management using a DataManager.
 """
 # pylint: disable=too-few-public-methods
 import logging
+import random
+import threading
 import time
 
 import requests
 from pyrate_limiter import Duration, Rate
 from pyrate_limiter.limiter import Limiter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from requests.exceptions import HTTPError, RequestException
 
 from housing_pricer.scraping.utilities.data_manager import DataManager
@@ -30,12 +33,18 @@ class ScrapeError(Exception):
         self,
         msg: str,
         call: str | None = None,
+        retry_after_seconds: float | None = None,
+        status_code: int | None = None,
     ):
         """
-        Initialize ScrapeError with optional message and the call.
+        Initialize ScrapeError with optional message, the call, the delay in seconds
+        requested by the server before retrying and the status code of the response,
+        if any.
         """
         super().__init__(msg)
         self.call = call
+        self.retry_after_seconds = retry_after_seconds
+        self.status_code = status_code
 
 
 class AlreadyScrapedError(Exception):
@@ -45,12 +54,16 @@ class AlreadyScrapedError(Exception):
 class Scraper:
     """Provides methods for scraping webpages."""
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         base_url: str,
         data_manager: DataManager,
         max_requests_per_minute: int,
         max_delay_seconds: int = 10,
+        retry_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+        max_connections: int = DEFAULT_POOLSIZE,
+        max_retry_after_seconds: float = 60.0,
     ):
         """
         Initialize a scraper with rate limiting and associated DataManager.
@@ -65,9 +78,25 @@ class Scraper:
             Max number of requests per minute.
         max_delay_seconds
             Max delay if max request per minute is exceeded.
+        retry_backoff_seconds
+            Base delay before retrying a failed request; doubled for every further
+            attempt and jittered to avoid retrying in lockstep.
+        max_backoff_seconds
+            Max delay before retrying a failed request, unless the server asks for a
+            longer one through a `Retry-After` header.
+        max_connections
+            Max number of connections kept alive for reuse; should be at least the
+            number of requests made concurrently, otherwise connections are
+            discarded and re-opened.
+        max_retry_after_seconds
+            Longest `Retry-After` delay requested by the server that is waited for
+            before retrying; a request asking for a longer delay is not retried.
         """
         self.base_url = base_url
         self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max_connections)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
         self._rate_limiter = Limiter(
             Rate(limit=max_requests_per_minute, interval=Duration.MINUTE),
             raise_when_fail=False,
@@ -76,6 +105,10 @@ class Scraper:
         self.data_manager = data_manager
         self._last_request_time = None
         self._request_interval = 60 / max_requests_per_minute
+        self._throttle_lock = threading.Lock()
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._max_backoff_seconds = max_backoff_seconds
+        self._max_retry_after_seconds = max_retry_after_seconds
 
     def get(self, endpoint: str, tries: int = 2) -> bytes:
         """
@@ -91,49 +124,110 @@ class Scraper:
         if self.data_manager.is_endpoint_scraped(endpoint):
             raise AlreadyScrapedError(f"{endpoint} already scraped; skipping")
 
+        url = self.base_url + endpoint
         for attempt in range(tries):
             self._throttle_requests()
             try:
-                content = self._try_get_except(endpoint)
+                content = self._try_get_except(url)
                 return content
 
-            except ScrapeError:
-                if attempt == tries - 1:
+            except ScrapeError as exc:
+                if attempt == tries - 1 or not self._is_retryable(exc):
                     raise
+                self._backoff(attempt, exc.retry_after_seconds)
 
         raise ScrapeError("Get failed for unknown reason.")
 
-    def _try_get_except(self, endpoint: str) -> bytes:
+    def _try_get_except(self, url: str) -> bytes:
         """
         Tries to get content; raises ScrapeError if something goes wrong.
 
         Parameters
         ----------
-        endpoint
-            Endpoint from which to get content from.
+        url
+            Full url, base url included, from which to get content from.
         """
         try:
             # check if request would exceed rate limit; if so delay
             self._rate_limiter.try_acquire("get")
 
-            response = self._session.get(f"{self.base_url}{endpoint}")
+            response = self._session.get(url)
             response.raise_for_status()
 
             if response.status_code == 204:
                 return b""
             return response.content
 
-        except (HTTPError, RequestException) as exc:
-            requested_url = f"{self.base_url}{endpoint}"
-            raise ScrapeError(msg=str(exc), call=requested_url) from exc
+        except HTTPError as exc:
+            raise ScrapeError(
+                msg=str(exc),
+                call=url,
+                retry_after_seconds=_parse_retry_after(exc.response),
+                status_code=None if exc.response is None else exc.response.status_code,
+            ) from exc
+        except RequestException as exc:
+            raise ScrapeError(msg=str(exc), call=url) from exc
+
+    def _is_retryable(self, exc: ScrapeError) -> bool:
+        """
+        Whether a failed request is retried; client errors other than 429 Too Many
+        Requests would fail again, and a `Retry-After` delay longer than
+        `max_retry_after_seconds` is not waited for.
+        """
+        if exc.status_code is not None and 400 <= exc.status_code < 500 and exc.status_code != 429:
+            return False
+        return exc.retry_after_seconds is None or (
+            exc.retry_after_seconds <= self._max_retry_after_seconds
+        )
+
+    def _backoff(self, attempt: int, retry_after_seconds: float | None = None):
+        """
+        Sleeps for an exponentially increasing, jittered delay before a retry, capped at
+        `max_backoff_seconds`.
+
+        Parameters
+        ----------
+        attempt
+            Zero-based index of the attempt that failed.
+        retry_after_seconds
+            Delay requested by the server through a `Retry-After` header; the sleep
+            is never shorter than this.
+        """
+        delay = self._retry_backoff_seconds * 2**attempt
+        delay += random.uniform(0, self._retry_backoff_seconds)
+        delay = min(delay, self._max_backoff_seconds)
+        if retry_after_seconds is not None:
+            delay = max(delay, retry_after_seconds)
+        time.sleep(delay)
 
     def _throttle_requests(self):
         """
         Enforces a delay between requests to adhere to the rate limit.
+
+        Safe to call from multiple threads; each caller reserves the next free request
+        slot while holding the lock and then sleeps until that slot outside of it.
         """
-        if self._last_request_time is not None:
-            elapsed_time = time.time() - self._last_request_time
-            wait_time = self._request_interval - elapsed_time
-            if wait_time > 0:
-                time.sleep(wait_time)
-        self._last_request_time = time.time()
+        with self._throttle_lock:
+            now = time.monotonic()
+            if self._last_request_time is None:
+                request_time = now
+            else:
+                request_time = max(now, self._last_request_time + self._request_interval)
+            self._last_request_time = request_time
+
+        wait_time = request_time - now
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+def _parse_retry_after(response: requests.Response | None) -> float | None:
+    """
+    Parses the `Retry-After` header of a response given in seconds; HTTP-date values
+    and missing headers give None.
+    """
+    if response is None:
+        return None
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
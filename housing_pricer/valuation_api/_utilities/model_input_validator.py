@@ -1,9 +1,15 @@
+import functools
 import json
+from pathlib import Path
+
 from pydantic import BaseModel, field_validator, ValidationInfo
 
+TRAINING_DOMAIN_PATH = Path(__file__).parent / "training_domain.json"
+
 
+@functools.lru_cache(maxsize=1)
 def _get_training_domain():
-    with open("_utilities/training_domain.json") as file:
+    with open(TRAINING_DOMAIN_PATH) as file:
         training_domain = json.load(file)
     return training_domain
 
@@ -1,8 +1,9 @@
+import functools
 import logging
 import json
 from typing import Any
 
-import pandas as pd
+import numpy as np
 import xgboost as xgb
 
 from housing_pricer.valuation_api._utilities.geocode_address import (
@@ -28,17 +29,27 @@ def main():
 
     model_input = request | coordinates
     validated_model_input = ModelInputValidator(**model_input)
-    dmatrix = xgb.DMatrix(pd.DataFrame([validated_model_input.model_dump()]))
+    model_input_values = validated_model_input.model_dump()
 
-    valuator = xgb.Booster()
-    valuator.load_model("xgb.json")
-
-    valuation = valuator.predict(dmatrix)[0]
+    valuator = load_valuator()
+    # inplace_predict does not check feature names, so order the row as the model expects
+    feature_names = valuator.feature_names or list(model_input_values)
+    model_input_row = np.array(
+        [[model_input_values[name] for name in feature_names]], dtype=np.float32
+    )
+    valuation = valuator.inplace_predict(model_input_row)[0]
     logger.info(
         "The estimated fair value for the requested housing is %d kr.", valuation
     )
 
 
+@functools.lru_cache(maxsize=1)
+def load_valuator(model_path: str = "xgb.json") -> xgb.Booster:
+    valuator = xgb.Booster()
+    valuator.load_model(model_path)
+    return valuator
+
+
 def read_request() -> dict[str, Any]:
     with open("test_listing.json", "r") as file:
         data_dict = json.load(file)
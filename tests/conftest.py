@@ -0,0 +1,19 @@
+# pylint: disable=missing-module-docstring
+from unittest.mock import MagicMock
+
+import pytest
+
+MOCK_CONTENT = b"Test Content"
+
+
+@pytest.fixture
+def mocked_session_get(mocker):
+    """
+    Patches `requests.Session.get` to return a successful response with `MOCK_CONTENT`;
+    tests needing another response can override `return_value` or `side_effect`.
+    """
+    mocked_response = MagicMock()
+    mocked_response.raise_for_status.return_value = None
+    mocked_response.status_code = 200
+    mocked_response.content = MOCK_CONTENT
+    return mocker.patch("requests.Session.get", return_value=mocked_response)
@@ -0,0 +1,269 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+import logging
+from itertools import chain, repeat
+from unittest.mock import patch
+
+import pytest
+
+from housing_pricer.scraping._booli_scraping import (
+    ANNONS,
+    BOSTAD,
+    MARKET_STATUS_CLASS,
+    MARKET_STATUS_CLASS_PATTERN,
+    DataProcessingError,
+    extract_listing_types_and_ids,
+    extract_market_status,
+    extract_relevant_data_as_json,
+    scrape_listings,
+)
+from housing_pricer.scraping.utilities.data_manager import DataManager
+from housing_pricer.scraping.utilities.scraper import AlreadyScrapedError, ScrapeError
+
+MOCK_APOLLO_STATE = {
+    "ROOT_QUERY": {"key": "value"},
+    "SoldProperty:1337": {"booliId": 1337, "streetAddress": "Attundavägen 14"},
+}
+MOCK_NEXT_DATA = {"props": {"pageProps": {"__APOLLO_STATE__": MOCK_APOLLO_STATE}}}
+MOCK_MARKET_STATUS = "Slutpris"
+
+
+def mock_listing_html(next_data: str, market_status: str | None = MOCK_MARKET_STATUS) -> bytes:
+    status_div = (
+        f'<div class="{MARKET_STATUS_CLASS}">{market_status}</div>' if market_status else ""
+    )
+    return (
+        "<html><head><title>Booli</title></head><body>"
+        f"{status_div}"
+        f'<script id="__NEXT_DATA__" type="application/json">{next_data}</script>'
+        "</body></html>"
+    ).encode()
+
+
+def test_extract_relevant_data_as_json():
+    data = extract_relevant_data_as_json(mock_listing_html(json.dumps(MOCK_NEXT_DATA)))
+    assert "ROOT_QUERY" not in data
+    assert data["SoldProperty:1337"] == MOCK_APOLLO_STATE["SoldProperty:1337"]
+    assert data["market_status"] == MOCK_MARKET_STATUS
+
+
+def test_extract_relevant_data_as_json_from_str():
+    html_content = mock_listing_html(json.dumps(MOCK_NEXT_DATA)).decode()
+    data = extract_relevant_data_as_json(html_content)
+    assert data["market_status"] == MOCK_MARKET_STATUS
+
+
+def test_extract_relevant_data_as_json_missing_next_data():
+    with pytest.raises(DataProcessingError):
+        extract_relevant_data_as_json(mock_listing_html(""))
+
+
+def test_extract_relevant_data_as_json_missing_market_status():
+    with pytest.raises(DataProcessingError):
+        extract_relevant_data_as_json(
+            mock_listing_html(json.dumps(MOCK_NEXT_DATA), market_status=None)
+        )
+
+
+def test_extract_relevant_data_as_json_invalid_json():
+    with pytest.raises(DataProcessingError):
+        extract_relevant_data_as_json(mock_listing_html("{not json"))
+
+
+def test_extract_relevant_data_as_json_missing_keys():
+    with pytest.raises(DataProcessingError):
+        extract_relevant_data_as_json(mock_listing_html(json.dumps({"props": {}})))
+
+
+def test_extract_market_status_with_nested_markup():
+    html_content = (
+        f'<span class="{MARKET_STATUS_CLASS}">Till salu</span>'
+        f'<div id="status" class="{MARKET_STATUS_CLASS}">'
+        "<span>Slutpris</span> &amp; <b>klar</b></div>"
+    ).encode()
+    assert extract_market_status(html_content) == "Slutpris & klar"
+
+
+def test_extract_market_status_with_nested_divs():
+    html_content = (
+        f'<div class="{MARKET_STATUS_CLASS}"><div>Slut</div>pris</div><div>Till salu</div>'
+    ).encode()
+    assert extract_market_status(html_content) == "Slutpris"
+
+
+def test_extract_market_status_without_closing_tag():
+    with pytest.raises(DataProcessingError):
+        extract_market_status(f'<div class="{MARKET_STATUS_CLASS}"><div>Slutpris</div>'.encode())
+
+
+def test_market_status_pattern_is_anchored_on_class_literal():
+    # a literal prefix lets the regex engine skip straight to candidate positions
+    assert MARKET_STATUS_CLASS_PATTERN.pattern.startswith(b'class="')
+
+
+def test_extract_market_status_ignores_class_on_other_attributes():
+    html_content = (
+        f'<div data-class="{MARKET_STATUS_CLASS}">Till salu</div>'
+        f'<div class="{MARKET_STATUS_CLASS}">Slutpris</div>'
+    ).encode()
+    assert extract_market_status(html_content) == "Slutpris"
+
+
+def test_extract_listing_types_and_ids():
+    search_content = (
+        b'<a href="https://www.booli.se/annons/123">'
+        b'<a href="https://www.booli.se/bostad/456">'
+        b'<a href="https://www.booli.se/sok/slutpriser">'
+    )
+    assert extract_listing_types_and_ids(search_content) == [
+        (ANNONS, "123"),
+        (BOSTAD, "456"),
+    ]
+
+
+MOCK_DATE = "2023-12-01"
+
+
+def mock_search_endpoint(page_nr: int) -> str:
+    return f"sok/slutpriser?maxSoldDate={MOCK_DATE}&minSoldDate={MOCK_DATE}&page={page_nr}"
+
+
+def mock_search_html(*listing_ids: int) -> bytes:
+    return b"".join(
+        f'<a href="https://www.booli.se/bostad/{listing_id}">'.encode()
+        for listing_id in listing_ids
+    )
+
+
+class StubScraper:  # pylint: disable=too-few-public-methods
+    """
+    Stands in for `Scraper`, returning or raising the response given for each endpoint
+    and recording every requested endpoint; unknown endpoints give an empty page.
+    """
+
+    def __init__(self, data_manager: DataManager, responses: dict[str, bytes | Exception]):
+        self.data_manager = data_manager
+        self.responses = responses
+        self.requested_endpoints: list[str] = []
+
+    def get(self, endpoint: str) -> bytes:
+        self.requested_endpoints.append(endpoint)
+        if self.data_manager.is_endpoint_scraped(endpoint):
+            raise AlreadyScrapedError(f"{endpoint} already scraped; skipping")
+        response = self.responses.get(endpoint, b"")
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def run_scrape_listings(scraper: StubScraper, duration_hrs: float = 1):
+    with patch.object(DataManager, "_get_dates_to_scrape", return_value=iter([MOCK_DATE])):
+        with patch.object(
+            scraper.data_manager, "flush", wraps=scraper.data_manager.flush
+        ) as mocked_flush:
+            scrape_listings(scraper, duration_hrs=duration_hrs, max_concurrent_requests=2)
+    return mocked_flush
+
+
+def test_scrape_listings_saves_listings_from_all_search_pages(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    listing_html = mock_listing_html(json.dumps(MOCK_NEXT_DATA))
+    scraper = StubScraper(
+        DataManager(tmp_path),
+        {
+            mock_search_endpoint(0): mock_search_html(1, 2),
+            mock_search_endpoint(1): mock_search_html(3, 4, 5),
+            "bostad/1": listing_html,
+            "bostad/2": listing_html,
+            "bostad/3": listing_html,
+            "bostad/4": mock_listing_html("{not json"),
+            "bostad/5": ScrapeError("404 Not Found"),
+        },
+    )
+
+    mocked_flush = run_scrape_listings(scraper)
+
+    saved_entries = list(scraper.data_manager.load_data())
+    assert sorted(entry["id"] for entry in saved_entries) == ["bostad/1", "bostad/2", "bostad/3"]
+    assert all(entry["date"] == MOCK_DATE for entry in saved_entries)
+    assert all(entry["data"]["market_status"] == MOCK_MARKET_STATUS for entry in saved_entries)
+    assert "Failed to decode JSON." in caplog.text
+    assert "404 Not Found" in caplog.text
+    assert mocked_flush.call_count == 2
+    assert mock_search_endpoint(2) in scraper.requested_endpoints
+
+
+def test_scrape_listings_logs_failed_flush_and_continues(tmp_path, caplog):
+    listing_html = mock_listing_html(json.dumps(MOCK_NEXT_DATA))
+    scraper = StubScraper(
+        DataManager(tmp_path),
+        {
+            mock_search_endpoint(0): mock_search_html(1),
+            mock_search_endpoint(1): mock_search_html(2),
+            "bostad/1": listing_html,
+            "bostad/2": listing_html,
+        },
+    )
+
+    with patch.object(DataManager, "_get_dates_to_scrape", return_value=iter([MOCK_DATE])):
+        with patch.object(
+            scraper.data_manager, "flush", side_effect=chain([OSError("disk full")], repeat(None))
+        ):
+            scrape_listings(scraper, duration_hrs=1, max_concurrent_requests=2)
+
+    assert "disk full" in caplog.text
+    assert mock_search_endpoint(2) in scraper.requested_endpoints
+    assert [entry["id"] for entry in scraper.data_manager.load_data()] == ["bostad/1", "bostad/2"]
+
+
+def test_scrape_listings_requests_each_new_listing_once(tmp_path):
+    data_manager = DataManager(tmp_path)
+    with data_manager:
+        data_manager.append_data_to_file(endpoint_id="bostad/1", date=MOCK_DATE, data={})
+
+    listing_html = mock_listing_html(json.dumps(MOCK_NEXT_DATA))
+    scraper = StubScraper(
+        data_manager,
+        {
+            mock_search_endpoint(0): mock_search_html(1, 2, 2),
+            "bostad/1": listing_html,
+            "bostad/2": listing_html,
+        },
+    )
+
+    run_scrape_listings(scraper)
+
+    requested_listings = [
+        endpoint for endpoint in scraper.requested_endpoints if endpoint.startswith(BOSTAD)
+    ]
+    assert requested_listings == ["bostad/2"]
+    assert [entry["id"] for entry in data_manager.load_data()] == ["bostad/1", "bostad/2"]
+
+
+def test_scrape_listings_stops_fetching_search_pages_after_deadline(tmp_path):
+    listing_html = mock_listing_html(json.dumps(MOCK_NEXT_DATA))
+    scraper = StubScraper(
+        DataManager(tmp_path),
+        {
+            mock_search_endpoint(0): mock_search_html(1),
+            mock_search_endpoint(1): mock_search_html(2),
+            "bostad/1": listing_html,
+            "bostad/2": listing_html,
+        },
+    )
+
+    # start of scraping and the check before search page 0 are within the one hour
+    # deadline, every later check is past it; only the scraping module's clock is
+    # patched, so that the throttle and logging keep the real one
+    with patch(
+        "housing_pricer.scraping._booli_scraping.monotonic",
+        side_effect=chain([0.0, 0.0], repeat(2 * 60**2)),
+    ):
+        run_scrape_listings(scraper, duration_hrs=1)
+
+    requested_search_pages = [
+        endpoint for endpoint in scraper.requested_endpoints if endpoint.startswith("sok/")
+    ]
+    assert requested_search_pages == [mock_search_endpoint(0)]
+    assert [entry["id"] for entry in scraper.data_manager.load_data()] == ["bostad/1"]
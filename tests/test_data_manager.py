@@ -2,7 +2,10 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=missing-class-docstring
 
-from tempfile import TemporaryDirectory
+import os
+from unittest.mock import patch
+
+import pytest
 
 from housing_pricer.scraping.utilities.data_manager import DataManager
 
@@ -17,83 +20,253 @@ MOCK_DATE = "2023-01-01"
 MOCK_ENTRY = {"id": MOCK_ENDPOINT_ID, "date": MOCK_DATE, "data": MOCK_DATA}
 
 
-def test_append_and_load():
-    with TemporaryDirectory() as base_dir:
-        data_manager = DataManager(base_dir=base_dir)
-        with data_manager:
-            data_manager.append_data_to_file(
-                endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
-            )
+def test_append_and_load(tmp_path):
+    data_manager = DataManager(base_dir=tmp_path)
+    with data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
 
-        loaded_entry = list(data_manager.load_data())[0]
-        assert MOCK_ENTRY == loaded_entry
+    loaded_entry = list(data_manager.load_data())[0]
+    assert MOCK_ENTRY == loaded_entry
 
 
-def test_mark_and_is_endpoint_scraped():
-    with TemporaryDirectory() as base_dir:
-        with DataManager(base_dir) as data_manager:
-            data_manager._mark_endpoint_scraped(MOCK_ENDPOINT_ID)
-            assert data_manager.is_endpoint_scraped(MOCK_ENDPOINT_ID)
+def test_append_is_buffered_until_batch_is_full(tmp_path):
+    data_manager = DataManager(base_dir=tmp_path, write_batch_size=2)
+    with data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+        assert not list(data_manager.load_data())
 
+        data_manager.append_data_to_file(
+            endpoint_id="bostad/1338", date=MOCK_DATE, data=MOCK_DATA
+        )
+        assert len(list(data_manager.load_data())) == 2
 
-def test_append_marks_endpoint_id():
-    with TemporaryDirectory() as base_dir:
-        data_manager = DataManager(base_dir=base_dir)
-        with data_manager:
-            data_manager.append_data_to_file(
-                endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
-            )
+
+def test_append_writes_remaining_buffer_on_exit(tmp_path):
+    data_manager = DataManager(base_dir=tmp_path, write_batch_size=64)
+    with data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+    assert list(data_manager.load_data()) == [MOCK_ENTRY]
+
+
+def test_flush_writes_buffer_to_file(tmp_path):
+    with DataManager(base_dir=tmp_path, write_batch_size=64) as data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+        data_manager.flush()
+        assert list(data_manager.load_data()) == [MOCK_ENTRY]
+
+
+def test_mark_and_is_endpoint_scraped(tmp_path):
+    with DataManager(tmp_path) as data_manager:
+        data_manager._mark_endpoint_scraped(MOCK_ENDPOINT_ID)
         assert data_manager.is_endpoint_scraped(MOCK_ENDPOINT_ID)
 
 
-def test_append_marks_endpoint_id_and_loads_properly():
-    with TemporaryDirectory() as base_dir:
-        with DataManager(base_dir=base_dir) as data_manager:
+def test_append_marks_endpoint_id(tmp_path):
+    data_manager = DataManager(base_dir=tmp_path)
+    with data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+    assert data_manager.is_endpoint_scraped(MOCK_ENDPOINT_ID)
+
+
+def test_append_marks_endpoint_id_and_loads_properly(tmp_path):
+    with DataManager(base_dir=tmp_path) as data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+    with DataManager(base_dir=tmp_path) as data_manager:
+        assert data_manager.is_endpoint_scraped(MOCK_ENDPOINT_ID)
+
+
+def test_load_scraped_endpoints_and_dates_from_line_prefix_and_full_parse(tmp_path):
+    endpoint_ids = [MOCK_ENDPOINT_ID, 7, 'bostad/"quoted"']
+    with DataManager(base_dir=tmp_path) as data_manager:
+        for endpoint_id in endpoint_ids:
             data_manager.append_data_to_file(
-                endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+                endpoint_id=endpoint_id, date=MOCK_DATE, data=MOCK_DATA
             )
-        with DataManager(base_dir=base_dir) as data_manager:
-            assert data_manager.is_endpoint_scraped(MOCK_ENDPOINT_ID)
+    with DataManager(base_dir=tmp_path) as data_manager:
+        assert data_manager._scraped_endpoints == set(endpoint_ids)
+        assert data_manager._scraped_dates == {MOCK_DATE}
 
 
-def test_non_exit_exception():
-    # pylint: disable=broad-exception-caught
-    # pylint: disable=broad-exception-raised
-    with TemporaryDirectory() as base_dir:
-        try:
-            with DataManager(base_dir) as data_manager:
+def test_index_file_is_rebuilt_when_missing_or_outdated(tmp_path):
+    with DataManager(base_dir=tmp_path) as data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+    index_file_path = data_manager._index_file_path
+
+    index_file_path.unlink()
+    with DataManager(base_dir=tmp_path) as data_manager:
+        assert data_manager.is_endpoint_scraped(MOCK_ENDPOINT_ID)
+    assert index_file_path.exists()
+
+    index_file_path.write_bytes(b"")
+    with DataManager(base_dir=tmp_path) as data_manager:
+        assert data_manager.is_endpoint_scraped(MOCK_ENDPOINT_ID)
+
+
+def test_index_file_is_removed_with_data_file(tmp_path):
+    with DataManager(base_dir=tmp_path) as data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+    data_manager._data_file_path.unlink()
+
+    with DataManager(base_dir=tmp_path) as data_manager:
+        data_manager.append_data_to_file(endpoint_id="bostad/1338", date="2023-01-02", data={})
+    with DataManager(base_dir=tmp_path) as data_manager:
+        assert [entry["id"] for entry in data_manager.load_data()] == ["bostad/1338"]
+        assert data_manager._scraped_endpoints == {"bostad/1338"}
+        assert data_manager._scraped_dates == {"2023-01-02"}
+
+
+def test_index_file_is_rebuilt_for_restored_data_file(tmp_path):
+    with DataManager(base_dir=tmp_path) as data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+    data_file_backup = data_manager._data_file_path.read_bytes()
+    with DataManager(base_dir=tmp_path) as data_manager:
+        data_manager.append_data_to_file(endpoint_id="bostad/1338", date="2023-01-02", data={})
+    # restored as by `cp -p`, keeping the older modification time
+    data_manager._data_file_path.write_bytes(data_file_backup)
+    os.utime(data_manager._data_file_path, ns=(0, 0))
+
+    with DataManager(base_dir=tmp_path) as data_manager:
+        assert data_manager._scraped_endpoints == {MOCK_ENDPOINT_ID}
+        assert data_manager._scraped_dates == {MOCK_DATE}
+
+
+def test_unreadable_index_file_is_rebuilt(tmp_path):
+    with DataManager(base_dir=tmp_path) as data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+    with open(data_manager._index_file_path, "ab") as index_file:
+        index_file.write(b'["bostad/13')
+
+    with DataManager(base_dir=tmp_path) as data_manager:
+        assert data_manager._scraped_endpoints == {MOCK_ENDPOINT_ID}
+
+
+def test_partially_written_last_line_is_removed(tmp_path):
+    with DataManager(base_dir=tmp_path) as data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+    data_file_size = data_manager._data_file_path.stat().st_size
+    with open(data_manager._data_file_path, "ab") as data_file:
+        data_file.write(b'{"id":"bostad/1338","date":"2023-01-02","data":{"key1":"val')
+    data_manager._index_file_path.unlink()
+
+    with DataManager(base_dir=tmp_path) as data_manager:
+        assert data_manager._data_file_path.stat().st_size == data_file_size
+        assert not data_manager.is_endpoint_scraped("bostad/1338")
+        assert data_manager._scraped_dates == {MOCK_DATE}
+        data_manager.append_data_to_file(endpoint_id="bostad/1339", date=MOCK_DATE, data={})
+
+    assert [entry["id"] for entry in data_manager.load_data()] == [MOCK_ENDPOINT_ID, "bostad/1339"]
+
+
+def test_partially_written_only_line_is_removed(tmp_path):
+    data_manager = DataManager(base_dir=tmp_path)
+    data_manager._data_file_path.write_bytes(b'{"id":"bostad/1338","date":"2023-01-02"')
+
+    with data_manager:
+        assert not data_manager._scraped_endpoints
+    assert data_manager._data_file_path.read_bytes() == b""
+
+
+def test_index_file_is_rebuilt_from_complete_lines_only(tmp_path):
+    with DataManager(base_dir=tmp_path) as data_manager:
+        data_manager.append_data_to_file(
+            endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+        )
+    data_file_size = data_manager._data_file_path.stat().st_size
+    with open(data_manager._data_file_path, "ab") as data_file:
+        data_file.write(b'{"id":"bostad/1338","date":"2023-01-02","data":{"key1":"val')
+
+    data_manager._rebuild_index_file()
+    assert data_manager._read_index_file() == ([[MOCK_ENDPOINT_ID, MOCK_DATE]], data_file_size)
+
+
+def test_exit_closes_files_when_writing_fails(tmp_path):
+    data_manager = DataManager(base_dir=tmp_path)
+    with patch.object(data_manager, "_flush_write_buffer", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            with data_manager:
                 data_manager.append_data_to_file(
                     endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
                 )
-                raise Exception
-        except Exception:
-            pass
-
-        with DataManager(base_dir) as data_manager:
-            loaded_entry = list(data_manager.load_data())[0]
-            assert loaded_entry == MOCK_ENTRY, "non-exit Exception breaks data loading"
-            assert data_manager.is_endpoint_scraped(
-                MOCK_ENDPOINT_ID
-            ), "non-exit Exception breaks scraped endpoint tracking"
-
-
-def test_keyboard_interrupt_in_context_handler_case():
-    with TemporaryDirectory() as base_dir:
-        try:
-            with DataManager(base_dir) as data_manager:
+
+    assert data_manager._data_file_handle.closed
+    assert data_manager._index_file_handle.closed
+
+
+def test_failed_index_write_does_not_duplicate_entries(tmp_path):
+    with DataManager(base_dir=tmp_path, write_batch_size=1) as data_manager:
+        index_file_handle = data_manager._index_file_handle
+        with patch.object(data_manager, "_index_file_handle") as failing_index_file_handle:
+            failing_index_file_handle.write.side_effect = OSError("disk full")
+            with pytest.raises(OSError):
                 data_manager.append_data_to_file(
                     endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
                 )
-                raise KeyboardInterrupt
-        except KeyboardInterrupt:
-            pass
+        assert data_manager._index_file_handle is index_file_handle
+        data_manager.append_data_to_file(endpoint_id="bostad/1338", date=MOCK_DATE, data={})
+
+    assert [entry["id"] for entry in data_manager.load_data()] == [MOCK_ENDPOINT_ID, "bostad/1338"]
+    with DataManager(base_dir=tmp_path) as data_manager:
+        assert data_manager._scraped_endpoints == {MOCK_ENDPOINT_ID, "bostad/1338"}
+
+
+def test_non_exit_exception(tmp_path):
+    # pylint: disable=broad-exception-caught
+    # pylint: disable=broad-exception-raised
+    try:
+        with DataManager(tmp_path) as data_manager:
+            data_manager.append_data_to_file(
+                endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+            )
+            raise Exception
+    except Exception:
+        pass
+
+    with DataManager(tmp_path) as data_manager:
+        loaded_entry = list(data_manager.load_data())[0]
+        assert loaded_entry == MOCK_ENTRY, "non-exit Exception breaks data loading"
+        assert data_manager.is_endpoint_scraped(
+            MOCK_ENDPOINT_ID
+        ), "non-exit Exception breaks scraped endpoint tracking"
+
+
+def test_keyboard_interrupt_in_context_handler_case(tmp_path):
+    try:
+        with DataManager(tmp_path) as data_manager:
+            data_manager.append_data_to_file(
+                endpoint_id=MOCK_ENDPOINT_ID, date=MOCK_DATE, data=MOCK_DATA
+            )
+            raise KeyboardInterrupt
+    except KeyboardInterrupt:
+        pass
 
-        with DataManager(base_dir) as data_manager:
-            loaded_entry = list(data_manager.load_data())[0]
-            assert loaded_entry == MOCK_ENTRY, "KeyboardInterrupt breaks data loading"
-            assert data_manager.is_endpoint_scraped(
-                MOCK_ENDPOINT_ID
-            ), "KeyboardInterrupt breaks scraped endpoint tracking"
+    with DataManager(tmp_path) as data_manager:
+        loaded_entry = list(data_manager.load_data())[0]
+        assert loaded_entry == MOCK_ENTRY, "KeyboardInterrupt breaks data loading"
+        assert data_manager.is_endpoint_scraped(
+            MOCK_ENDPOINT_ID
+        ), "KeyboardInterrupt breaks scraped endpoint tracking"
 
 
 TODAY: str = "2023-12-05"
@@ -102,53 +275,49 @@ VIABLE_DAYS = {"2023-12-04", "2023-12-03", "2023-12-02", BACK_TO_DATE}
 
 
 class TestDatesFunctionality:
-    def test_dates_to_scrape_with_no_dates_scraped(self):
-        with TemporaryDirectory() as base_dir:
-            with DataManager(base_dir) as data_manager:
-                assert (
-                    set(data_manager._get_dates_to_scrape(BACK_TO_DATE, _today=TODAY))
-                    == VIABLE_DAYS
-                )
+    def test_dates_to_scrape_with_no_dates_scraped(self, tmp_path):
+        with DataManager(tmp_path) as data_manager:
+            assert (
+                set(data_manager._get_dates_to_scrape(BACK_TO_DATE, _today=TODAY))
+                == VIABLE_DAYS
+            )
 
-    def test_dates_to_scrape_with_dates_scraped(self):
+    def test_dates_to_scrape_with_dates_scraped(self, tmp_path):
         for date_marked_as_scraped in VIABLE_DAYS:
-            with TemporaryDirectory() as base_dir:
-                with DataManager(base_dir) as data_manager:
-                    data_manager._mark_date_scraped(date_marked_as_scraped)
-                    dates_to_scrape = set(
-                        data_manager._get_dates_to_scrape(BACK_TO_DATE, _today=TODAY)
-                    )
-                    assert dates_to_scrape == VIABLE_DAYS
-
-    def test_marked_dates_by_adding_scraped_dates_sequentially(self):
+            with DataManager(tmp_path / date_marked_as_scraped) as data_manager:
+                data_manager._mark_date_scraped(date_marked_as_scraped)
+                dates_to_scrape = set(
+                    data_manager._get_dates_to_scrape(BACK_TO_DATE, _today=TODAY)
+                )
+                assert dates_to_scrape == VIABLE_DAYS
+
+    def test_marked_dates_by_adding_scraped_dates_sequentially(self, tmp_path):
         expected_dates = set()
-        with TemporaryDirectory() as base_dir:
-            with DataManager(base_dir) as data_manager:
-                for date_marked_as_scraped in VIABLE_DAYS:
-                    expected_dates.add(date_marked_as_scraped)
-                    data_manager._mark_date_scraped(date_marked_as_scraped)
-                    assert data_manager._scraped_dates == expected_dates
-
-    def test_dates_to_scrape_by_entering_context_with_multiple_scraped_dates(self):
+        with DataManager(tmp_path) as data_manager:
+            for date_marked_as_scraped in VIABLE_DAYS:
+                expected_dates.add(date_marked_as_scraped)
+                data_manager._mark_date_scraped(date_marked_as_scraped)
+                assert data_manager._scraped_dates == expected_dates
+
+    def test_dates_to_scrape_by_entering_context_with_multiple_scraped_dates(self, tmp_path):
         scraped_entries = [
             {"endpoint_id": 0, "date": "2023-12-04", "data": None},
             {"endpoint_id": 1, "date": "2023-12-03", "data": None},
             {"endpoint_id": 2, "date": "2023-12-02", "data": None},
         ]
         expected_dates_to_scrape = {"2023-12-04", "2023-12-02", "2023-12-01"}
-        with TemporaryDirectory() as base_dir:
-            with DataManager(base_dir) as data_manager:
-                for entry in scraped_entries:
-                    data_manager.append_data_to_file(**entry)
+        with DataManager(tmp_path) as data_manager:
+            for entry in scraped_entries:
+                data_manager.append_data_to_file(**entry)
 
-            with DataManager(base_dir) as data_manager:
-                dates_to_scrape = set(
-                    data_manager._get_dates_to_scrape(
-                        back_to_date=BACK_TO_DATE, _today=TODAY
-                    )
+        with DataManager(tmp_path) as data_manager:
+            dates_to_scrape = set(
+                data_manager._get_dates_to_scrape(
+                    back_to_date=BACK_TO_DATE, _today=TODAY
                 )
-                assert dates_to_scrape == expected_dates_to_scrape
+            )
+            assert dates_to_scrape == expected_dates_to_scrape
 
-                loaded_dates_to_scrape = set(data_manager.dates_to_scrape)
-                for date in expected_dates_to_scrape:
-                    assert date in loaded_dates_to_scrape
+            loaded_dates_to_scrape = set(data_manager.dates_to_scrape)
+            for date in expected_dates_to_scrape:
+                assert date in loaded_dates_to_scrape
@@ -0,0 +1,107 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+from housing_pricer.data_processing.data_processing_utils import (
+    COLUMN_NAMES,
+    format_json_to_dataframe,
+    get_nested_dict_value,
+)
+
+MOCK_PROPERTY_DETAILS = {
+    "booliId": 1337,
+    "soldDate": "2023-12-01",
+    "daysActive": 12,
+    "objectType": "Lägenhet",
+    "streetAddress": "Attundavägen 14",
+    "tenureForm": "Bostadsrätt",
+    "apartmentNumber": {"value": "1101"},
+    "descriptiveAreaName": "Centrala Täby",
+    "location": {"region": {"municipalityName": "Täby"}},
+    "livingArea": {"raw": 54.5},
+    "constructionYear": 1968,
+    "listPrice": {"raw": 2_995_000},
+    "soldPrice": {"raw": 3_150_000},
+    "soldPriceType": "Slutpris",
+    "firstPrice": {"value": "2\xa0995\xa0000\xa0kr"},
+    "estimate": {
+        "price": {"raw": 3_100_000},
+        "low": {"value": "2\xa0900\xa0000\xa0kr"},
+        "high": {"formatted": "3\xa0300\xa0000\xa0kr"},
+    },
+    "monthlyPayment": {"formatted": "3\xa0512\xa0kr/mån"},
+    "rent": {"raw": 3512},
+    "operatingCost": {"raw": 450},
+    "energyClass": {"score": "C"},
+    "floor": {"value": 3},
+    "buildingFloors": 8,
+    "latitude": 59.4430162,
+    "longitude": 18.0678478,
+    "hasSolarPanels": False,
+    "agencyId": 12,
+    "agentId": 34,
+    "salesOfResidence": [{"booliId": "111"}, {"booliId": "222"}],
+}
+MOCK_ENTRY = {
+    "id": "bostad/2556516",
+    "date": "2023-12-01",
+    "data": {
+        "ROOT_QUERY": {},
+        "SoldProperty:1337": MOCK_PROPERTY_DETAILS,
+        "market_status": "Slutpris",
+    },
+}
+MOCK_ENTRY_WITHOUT_PROPERTY_DETAILS = {
+    "id": "annons/1",
+    "date": "2023-12-01",
+    "data": {"market_status": "Till salu"},
+}
+
+
+def test_format_json_to_dataframe():
+    dataframe = format_json_to_dataframe([MOCK_ENTRY])
+    assert tuple(dataframe.columns) == COLUMN_NAMES
+    assert len(dataframe) == 1
+
+    row = dataframe.iloc[0]
+    assert row["url_listing_type"] == "bostad"
+    assert row["url_listing_id"] == 2556516
+    assert row["market_status"] == "Slutpris"
+    assert row["booli_id"] == 1337
+    assert row["municipality"] == "Täby"
+    assert row["living_area"] == 54.5
+    assert row["sold_price"] == 3_150_000
+    assert row["booli_valuation_lb"] == 2_900_000
+    assert row["booli_valuation_ub"] == 3_300_000
+    assert row["energy_class"] == "C"
+    assert row["booli_ids_of_previous_sales"] == [111, 222]
+    assert row["n_previous_sales"] == 2
+
+
+def test_format_json_to_dataframe_skips_entries_missing_property_details():
+    dataframe = format_json_to_dataframe([MOCK_ENTRY_WITHOUT_PROPERTY_DETAILS, MOCK_ENTRY])
+    assert len(dataframe) == 1
+    assert dataframe.iloc[0]["booli_id"] == 1337
+
+
+def test_format_json_to_dataframe_missing_fields_are_none():
+    entry = {
+        "id": "annons/42",
+        "date": "2023-12-01",
+        "data": {"Listing:42": {"booliId": 42}, "market_status": "Till salu"},
+    }
+    row = format_json_to_dataframe([entry]).iloc[0]
+    assert row["booli_id"] == 42
+    assert row["sold_price"] is None
+    assert row["booli_valuation_lb"] is None
+    assert row["n_previous_sales"] == 0
+
+
+def test_get_nested_dict_value():
+    assert get_nested_dict_value(MOCK_PROPERTY_DETAILS, ["listPrice", "raw"]) == 2_995_000
+    assert get_nested_dict_value(MOCK_PROPERTY_DETAILS, ["listPrice", "missing"]) is None
+    assert get_nested_dict_value(MOCK_PROPERTY_DETAILS, ["booliId", "raw"]) is None
+    assert (
+        get_nested_dict_value(
+            MOCK_PROPERTY_DETAILS, ["estimate", "low", "value"], remove_numeric_formatting=True
+        )
+        == 2_900_000
+    )
@@ -1,19 +1,45 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
 from housing_pricer.valuation_api._utilities.geocode_address import (
-    _extract_coordinates,
     _format_search_query,
+    _request_address_coordinates,
+    geocode_address,
 )
 
+MOCK_COORDINATES = {"latitude": 59.4430162, "longitude": 18.0678478}
+MOCK_NOMINATIM_MATCHES = [{"lat": "59.4430162", "lon": "18.0678478", "display_name": "..."}]
+
 
 def test_format_endpoint():
     actual_output = _format_search_query(
         gata="Attundavägen", gatunummer="14", ort="Täby"
     )
-    expected_output = "Attundavägen+14,+Täby"
+    expected_output = "Attundavägen 14, Täby"
     assert actual_output == expected_output
 
 
-def test_extract_coordinates():
-    url = ".../maps/place/Attund...A4by/@59.4430162,18.0678478,17z/..."
-    expected_coordinates = {"latitude": 59.4430162, "longitude": 18.0678478}
-    coordinates = _extract_coordinates(url)
-    assert coordinates == expected_coordinates
+def test_request_address_coordinates():
+    with patch("requests.get") as mocked_get:
+        mocked_get.return_value = MagicMock(json=MagicMock(return_value=MOCK_NOMINATIM_MATCHES))
+        assert _request_address_coordinates("Attundavägen 14, Täby") == MOCK_COORDINATES
+        assert mocked_get.call_args.kwargs["params"]["q"] == "Attundavägen 14, Täby"
+
+
+def test_request_address_coordinates_without_match():
+    with patch("requests.get") as mocked_get:
+        mocked_get.return_value = MagicMock(json=MagicMock(return_value=[]))
+        with pytest.raises(RuntimeError):
+            _request_address_coordinates("Attundavägen 14, Täby")
+
+
+def test_geocode_address_is_cached_by_address(tmp_path):
+    cache_path = str(tmp_path / "geocoded_addresses")
+    with patch(
+        "housing_pricer.valuation_api._utilities.geocode_address._request_address_coordinates",
+        return_value=MOCK_COORDINATES,
+    ) as mocked_request:
+        assert geocode_address("Attundavägen", "14", "Täby", cache_path) == MOCK_COORDINATES
+        assert geocode_address("attundavägen", "14", "TÄBY", cache_path) == MOCK_COORDINATES
+        assert mocked_request.call_count == 1
@@ -1,78 +1,204 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-class-docstring
 # pylint: disable=protected-access
-from tempfile import TemporaryDirectory
-from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 import pytest
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError
 
 from housing_pricer.scraping.utilities.data_manager import DataManager
-from housing_pricer.scraping.utilities.scraper import AlreadyScrapedError, Scraper
+from housing_pricer.scraping.utilities.scraper import AlreadyScrapedError, ScrapeError, Scraper
 
 MOCK_URL = "https://example.com"
 MOCK_ENDPOINT = "/test-endpoint/1337"
 
 
-def test_scraper_initialization():
+def test_scraper_initialization(tmp_path):
     """
     Ensure that Scraper is correctly initialized.
     """
-    with TemporaryDirectory() as temp_dir:
-        scraper = Scraper(MOCK_URL, DataManager(temp_dir), 30, 10)
-        assert scraper.base_url == MOCK_URL
-        assert isinstance(scraper.data_manager, DataManager)
-        assert scraper._session is not None
-        assert scraper._rate_limiter is not None
+    scraper = Scraper(MOCK_URL, DataManager(tmp_path), 30, 10)
+    assert scraper.base_url == MOCK_URL
+    assert isinstance(scraper.data_manager, DataManager)
+    assert scraper._session is not None
+    assert scraper._rate_limiter is not None
 
 
-def test_succesful_get():
+def test_connection_pool_fits_max_connections(tmp_path):
     """
-    Mocks a succesful get and ensures content is return correctly.
+    Ensure that the session keeps at least `max_connections` connections alive.
     """
-    with TemporaryDirectory() as temp_dir:
-        scraper = Scraper(
-            MOCK_URL,
-            DataManager(temp_dir),
-            max_requests_per_minute=20,
-            max_delay_seconds=20,
-        )
+    scraper = Scraper(MOCK_URL, DataManager(tmp_path), 30, 10, max_connections=32)
+    assert scraper._session.get_adapter(MOCK_URL)._pool_maxsize == 32
+
 
-        with patch("requests.Session.get") as mocked_get:
-            mocked_response = MagicMock()
-            mocked_response.raise_for_status.return_value = None
-            mocked_response.status_code = 200
-            mocked_response.content = b"Test Content"
-            mocked_get.return_value = mocked_response
+def test_succesful_get(mocked_session_get, tmp_path):
+    """
+    Mocks a succesful get and ensures content is return correctly.
+    """
+    scraper = Scraper(
+        MOCK_URL,
+        DataManager(tmp_path),
+        max_requests_per_minute=20,
+        max_delay_seconds=20,
+    )
 
-            content = scraper.get(MOCK_ENDPOINT)
-            assert content == mocked_response.content
+    content = scraper.get(MOCK_ENDPOINT)
+    assert content == mocked_session_get.return_value.content
 
 
 @patch("time.sleep", return_value=None)
-def test_rate_limiting_and_throttling(mock_sleep):
+@pytest.mark.usefixtures("mocked_session_get")
+def test_rate_limiting_and_throttling(mock_sleep, tmp_path):
     """
     Check that if two succesful `.get` are called right
     after one another, the second call is being throttled.
     """
-    with TemporaryDirectory() as temp_dir:
-        scraper = Scraper(MOCK_URL, DataManager(temp_dir), 1, 10)
-        with patch("requests.Session.get") as mocked_get:
-            mocked_response = MagicMock()
-            mocked_response.status_code = 200
-            mocked_get.return_value = mocked_response
+    scraper = Scraper(MOCK_URL, DataManager(tmp_path), 1, 10)
+    scraper.get(MOCK_ENDPOINT)
+    scraper.get(MOCK_ENDPOINT)
+    mock_sleep.assert_called()
+
+
+@patch("time.sleep", return_value=None)
+def test_throttling_spaces_concurrent_requests(mock_sleep, tmp_path):
+    """
+    Check that concurrent callers each reserve their own request slot,
+    spaced by the request interval.
+    """
+    scraper = Scraper(MOCK_URL, DataManager(tmp_path), 60, 10)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(4):
+            executor.submit(scraper._throttle_requests)
+
+    wait_times = sorted(call.args[0] for call in mock_sleep.call_args_list)
+    assert wait_times == pytest.approx([1, 2, 3], abs=0.1)
+
+
+@patch("time.sleep", return_value=None)
+def test_retries_with_exponential_backoff(mock_sleep, mocked_session_get, tmp_path):
+    """
+    Check that failed requests are retried after a growing, jittered delay
+    and that the last failure is raised.
+    """
+    scraper = Scraper(
+        MOCK_URL,
+        DataManager(tmp_path),
+        max_requests_per_minute=60_000,
+        retry_backoff_seconds=1.0,
+    )
+    mocked_session_get.side_effect = RequestsConnectionError("boom")
+    with pytest.raises(ScrapeError):
+        scraper.get(MOCK_ENDPOINT, tries=3)
+
+    backoff_delays = [call.args[0] for call in mock_sleep.call_args_list if call.args[0] >= 1]
+    assert len(backoff_delays) == 2
+    assert 1 <= backoff_delays[0] <= 2
+    assert 2 <= backoff_delays[1] <= 3
+
+
+@patch("time.sleep", return_value=None)
+def test_backoff_is_capped(mock_sleep, mocked_session_get, tmp_path):
+    """
+    Check that the delay before a retry does not exceed `max_backoff_seconds`.
+    """
+    scraper = Scraper(
+        MOCK_URL,
+        DataManager(tmp_path),
+        max_requests_per_minute=60_000,
+        retry_backoff_seconds=20.0,
+        max_backoff_seconds=30.0,
+    )
+    mocked_session_get.side_effect = RequestsConnectionError("boom")
+    with pytest.raises(ScrapeError):
+        scraper.get(MOCK_ENDPOINT, tries=4)
+
+    backoff_delays = [call.args[0] for call in mock_sleep.call_args_list if call.args[0] >= 1]
+    assert len(backoff_delays) == 3
+    assert 20 <= backoff_delays[0] <= 30
+    assert backoff_delays[1:] == [30, 30]
+
+
+@patch("time.sleep", return_value=None)
+def test_client_error_is_not_retried(mock_sleep, mocked_session_get, tmp_path):
+    """
+    Check that a failed request with a 4xx status other than 429 is raised
+    without retrying.
+    """
+    scraper = Scraper(MOCK_URL, DataManager(tmp_path), max_requests_per_minute=60_000)
+    mocked_response = mocked_session_get.return_value
+    mocked_response.status_code = 404
+    mocked_response.headers = {}
+    mocked_response.raise_for_status.side_effect = HTTPError(
+        "404 Not Found", response=mocked_response
+    )
+    with pytest.raises(ScrapeError) as exc_info:
+        scraper.get(MOCK_ENDPOINT, tries=3)
+
+    assert exc_info.value.status_code == 404
+    assert mocked_session_get.call_count == 1
+    assert all(call.args[0] < 1 for call in mock_sleep.call_args_list)
+
+
+@patch("time.sleep", return_value=None)
+def test_retry_respects_retry_after_header(mock_sleep, mocked_session_get, tmp_path):
+    """
+    Check that a Retry-After header sent with a failed response is
+    respected before retrying.
+    """
+    scraper = Scraper(
+        MOCK_URL,
+        DataManager(tmp_path),
+        max_requests_per_minute=60_000,
+        retry_backoff_seconds=1.0,
+    )
+    mocked_response = mocked_session_get.return_value
+    mocked_response.status_code = 429
+    mocked_response.headers = {"Retry-After": "7"}
+    mocked_response.raise_for_status.side_effect = HTTPError(
+        "429 Too Many Requests", response=mocked_response
+    )
+    with pytest.raises(ScrapeError) as exc_info:
+        scraper.get(MOCK_ENDPOINT, tries=2)
+
+    assert exc_info.value.retry_after_seconds == 7
+    mock_sleep.assert_any_call(7)
+
+
+@patch("time.sleep", return_value=None)
+def test_retry_after_longer_than_max_is_not_waited_for(mock_sleep, mocked_session_get, tmp_path):
+    """
+    Check that a failed request asking for a longer delay than
+    `max_retry_after_seconds` is raised instead of retried.
+    """
+    scraper = Scraper(
+        MOCK_URL,
+        DataManager(tmp_path),
+        max_requests_per_minute=60_000,
+        max_retry_after_seconds=60,
+    )
+    mocked_response = mocked_session_get.return_value
+    mocked_response.status_code = 429
+    mocked_response.headers = {"Retry-After": "3600"}
+    mocked_response.raise_for_status.side_effect = HTTPError(
+        "429 Too Many Requests", response=mocked_response
+    )
+    with pytest.raises(ScrapeError) as exc_info:
+        scraper.get(MOCK_ENDPOINT, tries=3)
 
-            scraper.get(MOCK_ENDPOINT)
-            scraper.get(MOCK_ENDPOINT)
-            mock_sleep.assert_called()
+    assert exc_info.value.retry_after_seconds == 3600
+    assert mocked_session_get.call_count == 1
+    assert all(call.args[0] < 60 for call in mock_sleep.call_args_list)
 
 
-def test_raises_already_scraped_error():
+def test_raises_already_scraped_error(tmp_path):
     """
     Ensure that Scraper raises AlreadyScrapedError.
     """
-    with TemporaryDirectory() as temp_dir:
-        scraper = Scraper(MOCK_URL, DataManager(temp_dir), 20, 20)
+    scraper = Scraper(MOCK_URL, DataManager(tmp_path), 20, 20)
 
-        scraper.data_manager._mark_endpoint_scraped(MOCK_ENDPOINT)
-        with pytest.raises(AlreadyScrapedError):
-            scraper.get(MOCK_ENDPOINT)
+    scraper.data_manager._mark_endpoint_scraped(MOCK_ENDPOINT)
+    with pytest.raises(AlreadyScrapedError):
+        scraper.get(MOCK_ENDPOINT)